@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Скрипт для выгрузки таблиц videos и video_snapshots в колоночный файл
+(формат описан в src/columnar.py)
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+
+import asyncpg
+from dotenv import load_dotenv
+
+# Добавляем корневую директорию в sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.columnar import (
+    FORMAT_VERSION,
+    HEADER,
+    MAGIC,
+    MICROS_PER_DAY,
+    SNAPSHOT_COLUMNS,
+    SNAPSHOT_TIME_COLUMN,
+    VIDEO_COLUMNS,
+    VIDEO_TIME_COLUMN,
+    check_platform,
+    column_layout,
+    to_micros,
+)
+
+load_dotenv()
+
+# Настройки подключения к БД
+DB_CONFIG = {
+    "host": os.getenv("DB_HOST", "localhost"),
+    "port": int(os.getenv("DB_PORT", 5432)),
+    "database": os.getenv("DB_NAME", "videos_analytics"),
+    "user": os.getenv("DB_USER", "postgres"),
+    "password": os.getenv("DB_PASSWORD", ""),
+}
+
+OUTPUT_PATH = Path(__file__).parent.parent / "data" / "videos.vcol"
+
+UUID_COLUMNS = {"id", "creator_id", "video_id"}
+
+
+def build_day_index(stamps: array):
+    """
+    Дневной индекс по отсортированной колонке времени:
+    номера дней и смещение первой строки каждого дня (+ завершающее смещение)
+    """
+    days = array("q")
+    offsets = array("q")
+    for row, stamp in enumerate(stamps):
+        day = stamp // MICROS_PER_DAY
+        if not days or days[-1] != day:
+            days.append(day)
+            offsets.append(row)
+    offsets.append(len(stamps))
+    return days, offsets
+
+
+def encode_table(rows, columns, codes):
+    """Разложение строк по колонкам с заменой UUID на индексы словаря"""
+    encoded = {}
+    for name, typecode in columns:
+        if name in UUID_COLUMNS:
+            values = (codes[row[name]] for row in rows)
+        elif typecode == "q":
+            values = (to_micros(row[name]) for row in rows)
+        else:
+            values = (row[name] for row in rows)
+        encoded[name] = array(typecode, values)
+    return encoded
+
+
+def write_columnar(path: Path, videos, snapshots):
+    """Запись файла: сначала во временный, затем атомарная замена"""
+    check_platform()
+
+    uuids = sorted(
+        {row["id"] for row in videos}
+        | {row["creator_id"] for row in videos}
+        | {row["id"] for row in snapshots}
+        | {row["video_id"] for row in snapshots}
+    )
+    codes = {value: code for code, value in enumerate(uuids)}
+
+    video_data = encode_table(videos, VIDEO_COLUMNS, codes)
+    snapshot_data = encode_table(snapshots, SNAPSHOT_COLUMNS, codes)
+    video_data["days"], video_data["day_offsets"] = build_day_index(video_data[VIDEO_TIME_COLUMN])
+    snapshot_data["days"], snapshot_data["day_offsets"] = build_day_index(
+        snapshot_data[SNAPSHOT_TIME_COLUMN]
+    )
+
+    sections = {"uuids": b"".join(value.bytes for value in uuids)}
+    sections.update({f"videos.{name}": data for name, data in video_data.items()})
+    sections.update({f"snapshots.{name}": data for name, data in snapshot_data.items()})
+
+    counts = (
+        len(uuids),
+        len(videos),
+        len(snapshots),
+        len(video_data["days"]),
+        len(snapshot_data["days"]),
+    )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Уникальный временный файл рядом с целевым: параллельные экспорты не мешают друг другу
+    tmp = tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=path.name + ".", suffix=".tmp", delete=False
+    )
+    tmp_path = Path(tmp.name)
+    try:
+        with tmp as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, *counts))
+            for name, _, offset, _ in column_layout(*counts):
+                f.write(b"\0" * (offset - f.tell()))
+                f.write(sections[name])
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Процессы, уже открывшие старый файл через mmap, продолжат читать его
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return counts
+
+
+async def export_columnar(output_path: Path):
+    """
+    Выгрузка данных из базы в колоночный файл
+    """
+    conn = await asyncpg.connect(**DB_CONFIG)
+
+    try:
+        print("🔌 Подключение к базе данных...")
+
+        videos = await conn.fetch(f"""
+            SELECT {", ".join(name for name, _ in VIDEO_COLUMNS)}
+            FROM videos
+            ORDER BY {VIDEO_TIME_COLUMN}, id
+        """)
+        print(f"🎥 Прочитано видео: {len(videos)}")
+
+        snapshots = await conn.fetch(f"""
+            SELECT {", ".join(name for name, _ in SNAPSHOT_COLUMNS)}
+            FROM video_snapshots
+            ORDER BY {SNAPSHOT_TIME_COLUMN}, id
+        """)
+        print(f"📸 Прочитано снапшотов: {len(snapshots)}")
+
+        print(f"💾 Запись файла: {output_path}")
+        n_uuids, _, _, n_video_days, n_snapshot_days = write_columnar(output_path, videos, snapshots)
+
+        print("\n" + "="*60)
+        print(f"✅ Выгрузка завершена!")
+        print(f"🔑 UUID в словаре: {n_uuids}")
+        print(f"📅 Дней в индексе: видео {n_video_days}, снапшоты {n_snapshot_days}")
+        print(f"📦 Размер файла: {output_path.stat().st_size} байт")
+        print("="*60)
+
+    finally:
+        await conn.close()
+        print("\n🔌 Соединение с базой данных закрыто")
+
+
+async def main():
+    """
+    Основная функция
+    """
+    output_path = Path(sys.argv[1]) if len(sys.argv) > 1 else OUTPUT_PATH
+
+    print("\n🚀 Выгрузка videos и video_snapshots в колоночный файл")
+    print("="*60)
+
+    await export_columnar(output_path)
+
+    print("\n✅ Готово!")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,365 @@
+"""
+Чтение колоночного снапшота таблиц videos и video_snapshots через mmap.
+
+Формат файла (версия 1, little-endian, все секции выровнены по 8 байт):
+
+    заголовок   magic "VCOL", версия, количества строк/UUID/дней
+    uuids       отсортированный словарь UUID, по 16 байт на запись
+    videos      колонки таблицы videos, отсортированы по video_created_at
+    video_days  дневной индекс: номер дня и смещение первой строки дня
+    snapshots   колонки таблицы video_snapshots, отсортированы по created_at
+    snapshot_days  дневной индекс для снапшотов
+
+UUID хранятся как int32-индексы в словаре, счетчики — int32, временные
+метки — int64 (микросекунды от эпохи, UTC). Файл пишет
+scripts/export_columnar.py, раскладку секций считает column_layout().
+"""
+
+import mmap
+import struct
+import sys
+import uuid
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from .schemas import QueryParams
+
+MAGIC = b"VCOL"
+FORMAT_VERSION = 1
+
+# magic, версия, n_uuids, n_videos, n_snapshots, n_video_days, n_snapshot_days
+HEADER = struct.Struct("<4sHxx5q")
+
+UUID_SIZE = 16
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROS_PER_DAY = 86_400_000_000
+
+VIDEO_COLUMNS: List[Tuple[str, str]] = [
+    ("id", "i"),
+    ("creator_id", "i"),
+    ("video_created_at", "q"),
+    ("created_at", "q"),
+    ("updated_at", "q"),
+    ("views_count", "i"),
+    ("likes_count", "i"),
+    ("reports_count", "i"),
+    ("comments_count", "i"),
+]
+
+SNAPSHOT_COLUMNS: List[Tuple[str, str]] = [
+    ("id", "i"),
+    ("video_id", "i"),
+    ("views_count", "i"),
+    ("likes_count", "i"),
+    ("reports_count", "i"),
+    ("comments_count", "i"),
+    ("delta_views_count", "i"),
+    ("delta_likes_count", "i"),
+    ("delta_reports_count", "i"),
+    ("delta_comments_count", "i"),
+    ("created_at", "q"),
+    ("updated_at", "q"),
+]
+
+# Колонки, по которым строки отсортированы и построен дневной индекс
+VIDEO_TIME_COLUMN = "video_created_at"
+SNAPSHOT_TIME_COLUMN = "created_at"
+
+ITEM_SIZE = {"i": 4, "q": 8}
+
+DateLike = Union[date, datetime, str]
+
+
+def check_platform():
+    """
+    Колонки читаются и пишутся в нативном представлении (memoryview.cast,
+    array), поэтому оно должно совпадать с форматом файла
+    """
+    if sys.byteorder != "little":
+        raise RuntimeError("Columnar snapshot requires a little-endian platform")
+    for code, size in ITEM_SIZE.items():
+        if array(code).itemsize != size:
+            raise RuntimeError(
+                f"Columnar snapshot requires {size}-byte '{code}' items, "
+                f"got {array(code).itemsize}"
+            )
+
+
+def to_micros(dt: datetime) -> int:
+    """Перевод datetime в микросекунды от эпохи (UTC)"""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - EPOCH) // timedelta(microseconds=1)
+
+
+def from_micros(micros: int) -> datetime:
+    """Обратное преобразование микросекунд от эпохи в datetime (UTC)"""
+    return EPOCH + timedelta(microseconds=micros)
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def column_layout(
+    n_uuids: int,
+    n_videos: int,
+    n_snapshots: int,
+    n_video_days: int,
+    n_snapshot_days: int,
+) -> List[Tuple[str, str, int, int]]:
+    """
+    Раскладка секций файла: (имя, typecode, смещение, число элементов).
+
+    Для словаря UUID typecode равен "B", а число элементов — длина в байтах.
+    Экспортер пишет секции ровно в этом порядке, читатель по ним же
+    находит колонки, поэтому отдельный каталог секций в файле не нужен.
+    """
+    sections: List[Tuple[str, str, int]] = [("uuids", "B", n_uuids * UUID_SIZE)]
+    sections += [(f"videos.{name}", code, n_videos) for name, code in VIDEO_COLUMNS]
+    sections += [
+        ("videos.days", "q", n_video_days),
+        ("videos.day_offsets", "q", n_video_days + 1),
+    ]
+    sections += [(f"snapshots.{name}", code, n_snapshots) for name, code in SNAPSHOT_COLUMNS]
+    sections += [
+        ("snapshots.days", "q", n_snapshot_days),
+        ("snapshots.day_offsets", "q", n_snapshot_days + 1),
+    ]
+
+    layout = []
+    offset = HEADER.size
+    for name, code, count in sections:
+        offset = _align(offset)
+        layout.append((name, code, offset, count))
+        offset += count * ITEM_SIZE.get(code, 1)
+    return layout
+
+
+def _to_day(value: DateLike) -> int:
+    """Номер дня от эпохи для даты, datetime или строки YYYY-MM-DD"""
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    if isinstance(value, datetime):
+        return to_micros(value) // MICROS_PER_DAY
+    return (value - EPOCH.date()).days
+
+
+class ColumnarStore:
+    """
+    Колоночный снапшот БД, открытый через mmap без копирования данных.
+
+    Колонки доступны как memoryview поверх отображенного файла, поэтому
+    открытие занимает миллисекунды, а несколько процессов, открывших один
+    файл, делят общий page cache.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        check_platform()
+
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self._views: List[memoryview] = []
+
+        try:
+            self._load()
+        except Exception:
+            self.close()
+            raise
+
+    def _load(self):
+        if len(self._mmap) < HEADER.size:
+            raise ValueError(f"Columnar snapshot is truncated: {self.path}")
+
+        magic, version, *counts = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a columnar snapshot file: {self.path}")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported columnar snapshot version: {version}")
+
+        n_uuids, self.videos_count, self.snapshots_count, _, _ = counts
+        self.uuids_count = n_uuids
+
+        base = memoryview(self._mmap)
+        self._views.append(base)
+        self._columns: Dict[str, memoryview] = {}
+
+        for name, code, offset, count in column_layout(*counts):
+            end = offset + count * ITEM_SIZE.get(code, 1)
+            if end > len(self._mmap):
+                raise ValueError(f"Columnar snapshot is truncated: {self.path}")
+            view = base[offset:end]
+            self._views.append(view)
+            if code != "B":
+                view = view.cast(code)
+                self._views.append(view)
+            self._columns[name] = view
+
+    def close(self):
+        try:
+            for view in reversed(getattr(self, "_views", [])):
+                view.release()
+            self._views = []
+            if getattr(self, "_mmap", None) is not None:
+                try:
+                    self._mmap.close()
+                except BufferError:
+                    # Вызывающий код еще держит срезы колонок: отображение
+                    # освободится сборщиком мусора вместе с последним срезом
+                    pass
+                self._mmap = None
+        finally:
+            if getattr(self, "_file", None) is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> "ColumnarStore":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # --- Доступ к колонкам и словарю UUID ---
+
+    def column(self, table: str, name: str) -> memoryview:
+        """
+        Колонка таблицы ("videos" или "snapshots") как memoryview.
+
+        Срезы колонки ссылаются на отображенный файл и удерживают его
+        после close(), пока сами не будут освобождены.
+        """
+        key = f"{table}.{name}"
+        if key not in self._columns or name in ("days", "day_offsets"):
+            raise KeyError(f"Unknown column: {key}")
+        return self._columns[key]
+
+    def uuid_at(self, code: int) -> uuid.UUID:
+        """UUID по его индексу в словаре"""
+        start = code * UUID_SIZE
+        return uuid.UUID(bytes=bytes(self._columns["uuids"][start:start + UUID_SIZE]))
+
+    def uuid_code(self, value: Union[str, uuid.UUID]) -> Optional[int]:
+        """Индекс UUID в словаре (бинарный поиск) или None, если его нет"""
+        key = (value if isinstance(value, uuid.UUID) else uuid.UUID(value)).bytes
+        uuids = self._columns["uuids"]
+        lo, hi = 0, self.uuids_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = mid * UUID_SIZE
+            current = uuids[start:start + UUID_SIZE].tobytes()
+            if current < key:
+                lo = mid + 1
+            elif current > key:
+                hi = mid
+            else:
+                return mid
+        return None
+
+    # --- Диапазонные сканы ---
+
+    def day_range(
+        self, table: str, start: Optional[DateLike] = None, end: Optional[DateLike] = None
+    ) -> Tuple[int, int]:
+        """
+        Диапазон строк [lo, hi) таблицы за дни с start по end включительно.
+
+        Использует дневной индекс, сами временные метки не просматриваются.
+        """
+        days = self._columns[f"{table}.days"]
+        offsets = self._columns[f"{table}.day_offsets"]
+        first = 0 if start is None else bisect_left(days, _to_day(start))
+        last = len(days) if end is None else bisect_right(days, _to_day(end))
+        return offsets[first], offsets[max(first, last)]
+
+    def time_range(
+        self, table: str, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> Tuple[int, int]:
+        """Диапазон строк [lo, hi) с временной меткой в [start, end)"""
+        time_column = VIDEO_TIME_COLUMN if table == "videos" else SNAPSHOT_TIME_COLUMN
+        stamps = self._columns[f"{table}.{time_column}"]
+        # Сужаем бинарный поиск до дней, попадающих в диапазон
+        lo, hi = self.day_range(table, start, end)
+        if start is not None:
+            lo = bisect_left(stamps, to_micros(start), lo, hi)
+        if end is not None:
+            hi = bisect_left(stamps, to_micros(end), lo, hi)
+        return lo, hi
+
+    # --- Агрегаты ---
+
+    def total_videos_count(self) -> int:
+        return self.videos_count
+
+    def creator_videos_count(
+        self,
+        creator_id: Union[str, uuid.UUID],
+        start_date: Optional[DateLike] = None,
+        end_date: Optional[DateLike] = None,
+    ) -> int:
+        code = self.uuid_code(creator_id)
+        if code is None:
+            return 0
+        lo, hi = self.day_range("videos", start_date, end_date)
+        return self.column("videos", "creator_id")[lo:hi].tolist().count(code)
+
+    def videos_with_min_views(self, min_views: int) -> int:
+        return sum(1 for views in self.column("videos", "views_count") if views > min_views)
+
+    def total_views_growth(self, day: DateLike) -> int:
+        lo, hi = self.day_range("snapshots", day, day)
+        return sum(self.column("snapshots", "delta_views_count")[lo:hi])
+
+    def videos_with_new_views(self, day: DateLike) -> int:
+        lo, hi = self.day_range("snapshots", day, day)
+        video_ids = self.column("snapshots", "video_id")[lo:hi]
+        deltas = self.column("snapshots", "delta_views_count")[lo:hi]
+        return len({video for video, delta in zip(video_ids, deltas) if delta > 0})
+
+    async def execute_query(self, query_params: QueryParams) -> int:
+        """
+        Тот же интерфейс, что у Database.execute_query, но без обращения к PostgreSQL.
+
+        Даты, как и в Database, задают целые сутки UTC: [00:00, 00:00 следующего дня).
+        """
+        query_type = query_params.query_type
+        params = query_params.parameters
+
+        if query_type == "total_videos_count":
+            return self.total_videos_count()
+
+        elif query_type == "creator_videos_count":
+            creator_id = params.get("creator_id")
+            if not creator_id:
+                raise ValueError("creator_id required")
+            return self.creator_videos_count(
+                creator_id, params.get("start_date"), params.get("end_date")
+            )
+
+        elif query_type == "videos_with_min_views":
+            min_views = params.get("min_views")
+            if min_views is None:
+                raise ValueError("min_views required")
+            return self.videos_with_min_views(int(min_views))
+
+        elif query_type == "total_views_growth":
+            date_param = params.get("date")
+            if not date_param:
+                raise ValueError("date required")
+            return self.total_views_growth(date_param)
+
+        elif query_type == "videos_with_new_views":
+            date_param = params.get("date")
+            if not date_param:
+                raise ValueError("date required")
+            return self.videos_with_new_views(date_param)
+
+        else:
+            raise ValueError(f"Unknown query type: {query_type}")
@@ -1,7 +1,7 @@
 import os
 import asyncpg
 from typing import Optional
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from .schemas import QueryParams
 
 
@@ -51,8 +51,9 @@ class Database:
                 arg_num += 1
             
             if "end_date" in params:
-                end_dt = datetime.strptime(f"{params['end_date']} 23:59:59", "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
-                query += f" AND video_created_at <= ${arg_num}"
+                # Конец периода — начало следующего дня (исключительно), чтобы не терять последнюю секунду
+                end_dt = datetime.strptime(f"{params['end_date']} 00:00:00", "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc) + timedelta(days=1)
+                query += f" AND video_created_at < ${arg_num}"
                 args.append(end_dt)
             
             return await self.pool.fetchval(query, *args)
@@ -70,9 +71,9 @@ class Database:
             date = params.get("date")
             if not date:
                 raise ValueError("date required")
-            # Конвертируем дату в datetime объекты для начала и конца дня (UTC)
+            # Конвертируем дату в границы дня [начало, начало следующего дня) в UTC
             start_dt = datetime.strptime(f"{date} 00:00:00", "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
-            end_dt = datetime.strptime(f"{date} 23:59:59", "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+            end_dt = start_dt + timedelta(days=1)
             return await self.pool.fetchval("""
                 SELECT COALESCE(SUM(delta_views_count), 0)
                 FROM video_snapshots
@@ -84,7 +85,7 @@ class Database:
             if not date:
                 raise ValueError("date required")
             start_dt = datetime.strptime(f"{date} 00:00:00", "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
-            end_dt = datetime.strptime(f"{date} 23:59:59", "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+            end_dt = start_dt + timedelta(days=1)
             return await self.pool.fetchval("""
                 SELECT COUNT(DISTINCT video_id)
                 FROM video_snapshots
@@ -0,0 +1,184 @@
+"""
+Тесты колоночного снапшота: запись через scripts/export_columnar.py и чтение через src/columnar.py без БД
+"""
+
+import asyncio
+import importlib.util
+import random
+import sys
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# Добавляем корневую директорию в sys.path
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.columnar import ColumnarStore, from_micros
+from src.schemas import QueryParams
+
+_spec = importlib.util.spec_from_file_location("export_columnar", ROOT / "scripts" / "export_columnar.py")
+export_columnar = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(export_columnar)
+
+BASE = datetime(2025, 11, 1, tzinfo=timezone.utc)
+
+
+def make_rows(seed=1, n_creators=5, n_videos=50, hours=24 * 10):
+    rng = random.Random(seed)
+    creators = [uuid.UUID(int=rng.getrandbits(128)) for _ in range(n_creators)]
+    videos = [
+        {
+            "id": uuid.UUID(int=rng.getrandbits(128)),
+            "creator_id": rng.choice(creators),
+            "video_created_at": BASE + timedelta(minutes=rng.randint(0, 60 * 24 * 9)),
+            "created_at": BASE,
+            "updated_at": BASE,
+            "views_count": rng.randint(0, 3000),
+            "likes_count": rng.randint(0, 100),
+            "reports_count": 0,
+            "comments_count": rng.randint(0, 10),
+        }
+        for _ in range(n_videos)
+    ]
+    # Видео на самой границе суток: последняя секунда дня
+    videos[0]["video_created_at"] = datetime(2025, 11, 3, 23, 59, 59, 500000, tzinfo=timezone.utc)
+    videos.sort(key=lambda row: row["video_created_at"])
+
+    snapshots = []
+    for hour in range(hours):
+        stamp = BASE + timedelta(hours=hour, minutes=59, seconds=59, microseconds=700000)
+        for video in rng.sample(videos, 5):
+            snapshots.append({
+                "id": uuid.UUID(int=rng.getrandbits(128)),
+                "video_id": video["id"],
+                "views_count": rng.randint(0, 3000),
+                "likes_count": 0,
+                "reports_count": 0,
+                "comments_count": 0,
+                "delta_views_count": rng.randint(0, 3),
+                "delta_likes_count": 0,
+                "delta_reports_count": 0,
+                "delta_comments_count": 0,
+                "created_at": stamp,
+                "updated_at": stamp,
+            })
+    return creators, videos, snapshots
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    creators, videos, snapshots = make_rows()
+    path = tmp_path / "videos.vcol"
+    export_columnar.write_columnar(path, videos, snapshots)
+    return path, creators, videos, snapshots
+
+
+def on_day(stamp, day):
+    return stamp.date() == date.fromisoformat(day)
+
+
+def test_aggregates_match_brute_force(dataset):
+    path, creators, videos, snapshots = dataset
+    with ColumnarStore(path) as store:
+        assert store.total_videos_count() == len(videos)
+        assert store.snapshots_count == len(snapshots)
+
+        for day in ("2025-11-01", "2025-11-03", "2025-11-10", "2025-12-01"):
+            day_rows = [row for row in snapshots if on_day(row["created_at"], day)]
+            assert store.total_views_growth(day) == sum(row["delta_views_count"] for row in day_rows)
+            assert store.videos_with_new_views(day) == len(
+                {row["video_id"] for row in day_rows if row["delta_views_count"] > 0}
+            )
+
+        assert store.videos_with_min_views(1000) == sum(1 for row in videos if row["views_count"] > 1000)
+
+        for creator in creators:
+            assert store.creator_videos_count(creator) == sum(1 for row in videos if row["creator_id"] == creator)
+            expected = sum(
+                1 for row in videos
+                if row["creator_id"] == creator
+                and date(2025, 11, 2) <= row["video_created_at"].date() <= date(2025, 11, 3)
+            )
+            assert store.creator_videos_count(str(creator), "2025-11-02", "2025-11-03") == expected
+
+
+def test_time_range(dataset):
+    path, _, _, snapshots = dataset
+    start = BASE + timedelta(hours=5)
+    end = BASE + timedelta(hours=30, minutes=59, seconds=59, microseconds=700000)
+    with ColumnarStore(path) as store:
+        lo, hi = store.time_range("snapshots", start, end)
+        assert hi - lo == sum(1 for row in snapshots if start <= row["created_at"] < end)
+        stamps = store.column("snapshots", "created_at")
+        assert from_micros(stamps[lo]) >= start
+        assert from_micros(stamps[hi - 1]) < end
+
+
+def test_uuid_dictionary(dataset):
+    path, creators, videos, _ = dataset
+    with ColumnarStore(path) as store:
+        for row_index, video in enumerate(videos):
+            code = store.uuid_code(video["id"])
+            assert code == store.column("videos", "id")[row_index]
+            assert store.uuid_at(code) == video["id"]
+        assert store.uuid_at(store.uuid_code(creators[0].hex)) == creators[0]
+        assert store.uuid_code(uuid.UUID(int=0)) is None
+        assert store.creator_videos_count(uuid.UUID(int=0)) == 0
+
+
+def test_execute_query(dataset):
+    path, _, _, snapshots = dataset
+    with ColumnarStore(path) as store:
+        query = QueryParams(
+            query_type="total_views_growth", parameters={"date": "2025-11-02"}, raw_query=""
+        )
+        expected = sum(row["delta_views_count"] for row in snapshots if on_day(row["created_at"], "2025-11-02"))
+        assert asyncio.run(store.execute_query(query)) == expected
+
+        with pytest.raises(ValueError):
+            asyncio.run(store.execute_query(QueryParams(query_type="unknown", raw_query="")))
+
+
+def test_empty_tables(tmp_path):
+    path = tmp_path / "empty.vcol"
+    export_columnar.write_columnar(path, [], [])
+    with ColumnarStore(path) as store:
+        assert store.total_videos_count() == 0
+        assert store.total_views_growth("2025-11-01") == 0
+        assert store.videos_with_new_views("2025-11-01") == 0
+        assert store.videos_with_min_views(0) == 0
+        assert store.day_range("snapshots") == (0, 0)
+        assert store.time_range("snapshots", BASE, BASE + timedelta(days=1)) == (0, 0)
+        assert store.uuid_code(uuid.UUID(int=1)) is None
+
+
+def test_close_with_held_slice(dataset):
+    path = dataset[0]
+    with ColumnarStore(path) as store:
+        held = store.column("videos", "views_count")[0:3]
+    assert store._mmap is None
+    assert store._file is None
+    assert len(held.tolist()) == 3
+    held.release()
+
+
+def test_invalid_file(tmp_path):
+    path = tmp_path / "bad.vcol"
+    path.write_bytes(b"NOPE" + b"\0" * 60)
+    with pytest.raises(ValueError):
+        ColumnarStore(path)
+
+
+def test_failed_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    _, videos, snapshots = make_rows()
+
+    def fail_replace(src, dst):
+        raise OSError("replace failed")
+
+    monkeypatch.setattr(export_columnar.os, "replace", fail_replace)
+    with pytest.raises(OSError):
+        export_columnar.write_columnar(tmp_path / "videos.vcol", videos, snapshots)
+    assert list(tmp_path.iterdir()) == []